@@ -13,7 +13,7 @@ from app.core.auth import User
 from app.models import ChatRequest, ChatResponse, SearchRequest, SearchResponse, SearchResult
 from app.services.rag_chat import RAGChatService
 from app.services.chunking import chunking_service
-from app.services.vector_store import vector_store
+from app.services.vector_store import get_vector_store
 
 logger = logging.getLogger(__name__)
 
@@ -166,7 +166,7 @@ async def semantic_search(
         query_embedding = await chunking_service.generate_embedding(request.query)
         
         # Search vector store
-        search_results = await vector_store.search(
+        search_results = await get_vector_store().search(
             query_embedding=query_embedding,
             top_k=request.top_k
         )
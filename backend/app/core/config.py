@@ -59,6 +59,8 @@ class Settings(BaseSettings):
     # Vector Store
     VECTOR_STORE_TYPE: str = Field(default="faiss", env="VECTOR_STORE_TYPE")  # faiss or pinecone
     FAISS_INDEX_PATH: str = Field(default="./faiss_index", env="FAISS_INDEX_PATH")
+    FAISS_INDEX_TYPE: str = Field(default="hnsw", env="FAISS_INDEX_TYPE")  # flat, hnsw, ivf, sq8
+    FAISS_NUM_THREADS: int = Field(default=0, env="FAISS_NUM_THREADS")  # 0 = all cores minus one
     PINECONE_API_KEY: Optional[str] = Field(default=None, env="PINECONE_API_KEY")
     PINECONE_ENVIRONMENT: Optional[str] = Field(default=None, env="PINECONE_ENVIRONMENT")
     PINECONE_INDEX_NAME: Optional[str] = Field(default=None, env="PINECONE_INDEX_NAME")
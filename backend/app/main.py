@@ -7,6 +7,7 @@ from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 import logging
 import os
+import sys
 
 from app.core.config import settings
 from app.core.database import db_manager
@@ -42,6 +43,17 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down application...")
     await db_manager.disconnect()
     await cache.close()
+
+    # Close the transcription HTTP client if the service was ever used
+    # (imported lazily, so don't instantiate it just to close it)
+    transcription_module = sys.modules.get("app.services.transcription")
+    if transcription_module is not None:
+        await transcription_module.transcription_service.aclose()
+
+    unified_module = sys.modules.get("app.services.unified_transcription")
+    if unified_module is not None and unified_module._default_service is not None:
+        await unified_module._default_service.aclose()
+
     logger.info("Application shut down successfully")
 
 
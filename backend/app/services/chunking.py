@@ -199,7 +199,7 @@ class ChunkingService:
                 from app.services.free_embeddings import get_embedding_service
                 free_service = get_embedding_service()
                 embeddings = free_service.generate_embeddings([text])
-                return embeddings[0]
+                return embeddings[0].tolist()
             
             response = await self.client.embeddings.create(
                 model=settings.OPENAI_EMBEDDING_MODEL,
@@ -217,16 +217,16 @@ class ChunkingService:
         self,
         texts: List[str],
         batch_size: int = 100
-    ) -> List[List[float]]:
+    ) -> np.ndarray:
         """
         Generate embeddings for multiple texts in batches.
-        
+
         Args:
             texts: List of texts to embed
             batch_size: Number of texts per batch
-            
+
         Returns:
-            List of embedding vectors
+            Embedding matrix of shape (len(texts), dimension), float32
         """
         all_embeddings = []
         
@@ -254,9 +254,9 @@ class ChunkingService:
                 all_embeddings.extend(batch_embeddings)
                 
                 logger.info(f"Generated embeddings for batch {i//batch_size + 1}")
-            
+
             logger.info(f"Generated {len(all_embeddings)} embeddings total")
-            return all_embeddings
+            return np.asarray(all_embeddings, dtype=np.float32)
             
         except Exception as e:
             logger.error(f"Batch embedding generation failed: {e}")
@@ -6,6 +6,8 @@ import logging
 from pathlib import Path
 from typing import Optional, Dict, List
 from datetime import datetime
+
+import numpy as np
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.models import (
@@ -16,7 +18,7 @@ from app.services.file_upload import file_upload_service
 from app.services.pdf_extraction import pdf_extraction_service
 from app.services.unified_transcription import get_default_transcription_service
 from app.services.chunking import chunking_service
-from app.services.vector_store import vector_store
+from app.services.vector_store import get_vector_store
 
 logger = logging.getLogger(__name__)
 
@@ -163,45 +165,69 @@ class DocumentProcessor:
     async def _process_video(self, document: Document, file_path: Path):
         """Process video file."""
         logger.info(f"Processing video: {file_path}")
-        
+
         # Get transcription service
         transcription_service = get_default_transcription_service()
-        
+
+        if transcription_service.provider == "deepgram":
+            # Deepgram accepts a streamed body: pipe ffmpeg output straight
+            # to the API without writing an intermediate audio file
+            audio_stream = transcription_service.stream_audio_from_video(file_path)
+            transcription, timestamps, audio_metadata = (
+                await transcription_service.transcribe(audio_stream)
+            )
+            await self._store_video_transcription(
+                document, transcription, timestamps, audio_metadata
+            )
+            return
+
         # Extract audio from video
         audio_path = await transcription_service.extract_audio_from_video(file_path)
-        
+
         try:
             # Transcribe audio with timestamps
             transcription, timestamps, audio_metadata = await transcription_service.transcribe(
                 audio_path
             )
-            
-            # Update document with transcription
-            await self.db.documents.update_one(
-                {"_id": document.id},
-                {"$set": {
-                    "transcription": transcription,
-                    "metadata.duration": audio_metadata.get("duration"),
-                    "updated_at": datetime.utcnow()
-                }}
-            )
-            
-            # Chunk transcription with timestamps
-            chunks = chunking_service.chunk_transcription_with_timestamps(
-                transcription,
-                timestamps,
-                document.id
+
+            await self._store_video_transcription(
+                document, transcription, timestamps, audio_metadata
             )
-            
-            # Generate embeddings and store
-            await self._store_chunks(document.id, chunks, FileType.VIDEO)
-            
-            logger.info(f"Video processing completed: {len(chunks)} chunks created")
-            
+
         finally:
             # Clean up extracted audio
             if audio_path.exists():
                 audio_path.unlink()
+
+    async def _store_video_transcription(
+        self,
+        document: Document,
+        transcription: str,
+        timestamps: List,
+        audio_metadata: Dict
+    ):
+        """Persist a video transcription and its chunks."""
+        # Update document with transcription
+        await self.db.documents.update_one(
+            {"_id": document.id},
+            {"$set": {
+                "transcription": transcription,
+                "metadata.duration": audio_metadata.get("duration"),
+                "updated_at": datetime.utcnow()
+            }}
+        )
+
+        # Chunk transcription with timestamps
+        chunks = chunking_service.chunk_transcription_with_timestamps(
+            transcription,
+            timestamps,
+            document.id
+        )
+
+        # Generate embeddings and store
+        await self._store_chunks(document.id, chunks, FileType.VIDEO)
+
+        logger.info(f"Video processing completed: {len(chunks)} chunks created")
     
     async def _store_chunks(
         self,
@@ -241,7 +267,8 @@ class DocumentProcessor:
                 "document_id": document_id,
                 "chunk_index": chunk["chunk_index"],
                 "text": chunk["text"],
-                "embedding": embedding,
+                # BSON can't encode ndarray rows; FAISS gets the raw matrix
+                "embedding": embedding.tolist() if isinstance(embedding, np.ndarray) else embedding,
                 "metadata": chunk_metadata.dict(),
                 "created_at": datetime.utcnow()
             }
@@ -262,9 +289,10 @@ class DocumentProcessor:
             await self.db.chunks.insert_many(chunk_docs)
             logger.info(f"Stored {len(chunk_docs)} chunks in MongoDB")
         
-        # Store embeddings in vector store
+        # Store embeddings in vector store; persistence is debounced
+        # inside add_vectors so back-to-back documents share one write
+        vector_store = get_vector_store()
         await vector_store.add_vectors(embeddings, vector_metadata)
-        vector_store.save_index()
         logger.info(f"Stored {len(embeddings)} embeddings in FAISS")
         
         # Update document chunk count
@@ -292,9 +320,9 @@ class DocumentProcessor:
             # Delete chunks from database
             await self.db.chunks.delete_many({"document_id": document_id})
             
-            # Delete vectors from vector store
+            # Delete vectors from vector store (saves internally)
+            vector_store = get_vector_store()
             await vector_store.delete_by_document_id(document_id)
-            vector_store.save_index()
             
             # Delete document from database
             await self.db.documents.delete_one({"_id": document_id})
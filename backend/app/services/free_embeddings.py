@@ -27,49 +27,47 @@ class FreeEmbeddingService:
         self.dimension = self.model.get_sentence_embedding_dimension()
         logger.info(f"Model loaded. Embedding dimension: {self.dimension}")
     
-    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+    def generate_embeddings(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings for a list of texts.
-        
+
         Args:
             texts: List of text strings to embed
-            
+
         Returns:
-            List of embedding vectors
+            Embedding matrix of shape (len(texts), dimension), float32
         """
         if not texts:
-            return []
-        
+            return np.empty((0, self.dimension), dtype=np.float32)
+
         logger.info(f"Generating embeddings for {len(texts)} texts")
-        
-        # Generate embeddings
+
+        # Generate embeddings; keep the ndarray so downstream consumers
+        # (FAISS) avoid a list-of-lists round trip
         embeddings = self.model.encode(
             texts,
             convert_to_numpy=True,
             show_progress_bar=False,
             normalize_embeddings=True  # Normalize for cosine similarity
         )
-        
-        # Convert to list of lists
-        embeddings_list = embeddings.tolist()
-        
-        logger.info(f"Generated {len(embeddings_list)} embeddings")
-        return embeddings_list
-    
+
+        logger.info(f"Generated {len(embeddings)} embeddings")
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
+
     async def generate_embeddings_batch(
         self,
         texts: List[str],
         batch_size: int = 32
-    ) -> List[List[float]]:
+    ) -> np.ndarray:
         """
         Generate embeddings in batches (async wrapper for compatibility).
         
         Args:
             texts: List of text strings to embed
             batch_size: Number of texts to process at once
-            
+
         Returns:
-            List of embedding vectors
+            Embedding matrix of shape (len(texts), dimension), float32
         """
         # Sentence transformers is synchronous, but we wrap it for compatibility
         return self.generate_embeddings(texts)
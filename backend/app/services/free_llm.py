@@ -32,11 +32,36 @@ class FreeLLMService:
         if self.model is None:
             logger.info(f"Loading free LLM model: {self.model_name}")
             logger.info(f"This may take a minute on first run (downloading ~900MB)...")
-            
+
             self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-            self.model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name)
-            self.model.to(self.device)
-            
+
+            if self.device == "cuda":
+                # int8 weights via bitsandbytes: ~4x smaller and faster
+                # generation on INT8 tensor cores
+                try:
+                    self.model = AutoModelForSeq2SeqLM.from_pretrained(
+                        self.model_name,
+                        load_in_8bit=True,
+                        device_map="auto"
+                    )
+                    logger.info("Model loaded with int8 quantization (bitsandbytes)")
+                except Exception as e:
+                    logger.warning(f"int8 load failed ({e}), falling back to full precision")
+                    self.model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name)
+                    self.model.to(self.device)
+            else:
+                # CPU: dynamic quantization of the Linear layers to int8
+                # halves memory bandwidth during generation
+                model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name)
+                try:
+                    self.model = torch.quantization.quantize_dynamic(
+                        model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                    logger.info("Model quantized to int8 (dynamic, CPU)")
+                except Exception as e:
+                    logger.warning(f"Dynamic quantization failed ({e}), using full precision")
+                    self.model = model
+
             logger.info(f"Model loaded successfully on device: {self.device}")
     
     def generate_response(
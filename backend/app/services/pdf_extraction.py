@@ -3,14 +3,45 @@ PDF text extraction service using PyPDF2 and pdfplumber.
 Extracts text content and metadata from PDF files.
 """
 import logging
+import mmap
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 import PyPDF2
+import PyPDF2._cmap
 import pdfplumber
-from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# PyPDF2 re-parses a font's ToUnicode CMap on every page that uses the
+# font, which dominates extraction time for long documents. Cache parsed
+# maps keyed on the raw CMap bytes so each distinct CMap is parsed once.
+_original_parse_to_unicode = PyPDF2._cmap.parse_to_unicode
+_cmap_cache: Dict[Tuple[bytes, int], Tuple[Dict, int, List[int]]] = {}
+_CMAP_CACHE_MAX = 1024
+
+
+def _parse_to_unicode_cached(ft, space_code):
+    """Cached wrapper around PyPDF2's CMap parser."""
+    try:
+        if "/ToUnicode" not in ft:
+            return _original_parse_to_unicode(ft, space_code)
+        key = (bytes(PyPDF2._cmap.prepare_cm(ft)), space_code)
+    except Exception:
+        return _original_parse_to_unicode(ft, space_code)
+
+    cached = _cmap_cache.get(key)
+    if cached is None:
+        cached = _original_parse_to_unicode(ft, space_code)
+        if len(_cmap_cache) < _CMAP_CACHE_MAX:
+            _cmap_cache[key] = cached
+
+    # Return copies: callers may mutate the map
+    map_dict, space, int_entry = cached
+    return dict(map_dict), space, list(int_entry)
+
+
+PyPDF2._cmap.parse_to_unicode = _parse_to_unicode_cached
+
 
 class PDFExtractionService:
     """Service for extracting text and metadata from PDF files."""
@@ -26,17 +57,17 @@ class PDFExtractionService:
             Tuple of (extracted_text, metadata)
         """
         try:
-            # Use pdfplumber for better text extraction
-            text_content = await self._extract_with_pdfplumber(file_path)
-            
+            # Use pdfplumber for better text extraction; text and metadata
+            # come from the same open so the PDF is only parsed once
+            text_content, metadata = await self._extract_with_pdfplumber(file_path)
+
             # If pdfplumber fails, fallback to PyPDF2
             if not text_content or len(text_content.strip()) < 100:
                 logger.info("Falling back to PyPDF2 for text extraction")
                 text_content = await self._extract_with_pypdf2(file_path)
-            
-            # Extract metadata
-            metadata = await self._extract_metadata(file_path)
-            
+                if metadata is None:
+                    metadata = await self._extract_metadata(file_path)
+
             logger.info(
                 f"Extracted {len(text_content)} characters from PDF "
                 f"with {metadata.get('pages', 0)} pages"
@@ -48,12 +79,29 @@ class PDFExtractionService:
             logger.error(f"Failed to extract PDF content: {e}")
             raise
     
-    async def _extract_with_pdfplumber(self, file_path: Path) -> str:
-        """Extract text using pdfplumber (better quality)."""
+    async def _extract_with_pdfplumber(
+        self, file_path: Path
+    ) -> Tuple[str, Optional[Dict]]:
+        """Extract text and metadata using pdfplumber (single PDF parse)."""
         text_parts = []
-        
+
         try:
             with pdfplumber.open(file_path) as pdf:
+                # Grab metadata from the already-open document so we don't
+                # need a second parse just for document info
+                doc_info = pdf.metadata or {}
+                metadata = {
+                    "pages": len(pdf.pages),
+                    "title": doc_info.get("Title"),
+                    "author": doc_info.get("Author"),
+                    "subject": doc_info.get("Subject"),
+                    "creator": doc_info.get("Creator"),
+                    "producer": doc_info.get("Producer"),
+                    "creation_date": self._parse_pdf_date(
+                        doc_info.get("CreationDate")
+                    ),
+                }
+
                 for page_num, page in enumerate(pdf.pages, 1):
                     try:
                         text = page.extract_text()
@@ -64,21 +112,25 @@ class PDFExtractionService:
                     except Exception as e:
                         logger.warning(f"Failed to extract page {page_num}: {e}")
                         continue
-            
-            return "\n".join(text_parts)
-            
+
+            return "\n".join(text_parts), metadata
+
         except Exception as e:
             logger.error(f"pdfplumber extraction failed: {e}")
-            return ""
+            return "", None
     
     async def _extract_with_pypdf2(self, file_path: Path) -> str:
         """Extract text using PyPDF2 (fallback)."""
         text_parts = []
         
         try:
-            with open(file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                
+            # Memory-map the file so PyPDF2's many small seek+read calls
+            # become memory reads instead of syscalls; mmap objects are
+            # seekable file-likes, so the reader pages on demand
+            with open(file_path, 'rb') as file, \
+                 mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                reader = PyPDF2.PdfReader(mm)
+
                 for page_num in range(len(reader.pages)):
                     try:
                         page = reader.pages[page_num]
@@ -109,8 +161,9 @@ class PDFExtractionService:
         }
         
         try:
-            with open(file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
+            with open(file_path, 'rb') as file, \
+                 mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                reader = PyPDF2.PdfReader(mm)
                 metadata["pages"] = len(reader.pages)
                 
                 # Extract document info
@@ -122,22 +175,34 @@ class PDFExtractionService:
                     metadata["producer"] = reader.metadata.get('/Producer')
                     
                     # Parse creation date
-                    creation_date = reader.metadata.get('/CreationDate')
-                    if creation_date:
-                        try:
-                            # PDF date format: D:YYYYMMDDHHmmSS
-                            if creation_date.startswith('D:'):
-                                date_str = creation_date[2:16]  # YYYYMMDDHHmmSS
-                                metadata["creation_date"] = datetime.strptime(
-                                    date_str, '%Y%m%d%H%M%S'
-                                ).isoformat()
-                        except Exception:
-                            pass
-            
+                    metadata["creation_date"] = self._parse_pdf_date(
+                        reader.metadata.get('/CreationDate')
+                    )
+
         except Exception as e:
             logger.warning(f"Failed to extract PDF metadata: {e}")
-        
+
         return metadata
+
+    @staticmethod
+    def _parse_pdf_date(creation_date: Optional[str]) -> Optional[str]:
+        """Parse a PDF date string (D:YYYYMMDDHHmmSS) to ISO format."""
+        if not creation_date:
+            return None
+        try:
+            if creation_date.startswith('D:'):
+                # PDF dates are a rigid fixed-width layout, so slice the
+                # fields directly instead of going through strptime's
+                # format-string interpreter
+                date_str = creation_date[2:16]  # YYYYMMDDHHmmSS
+                if len(date_str) == 14 and date_str.isdigit():
+                    return (
+                        f"{date_str[0:4]}-{date_str[4:6]}-{date_str[6:8]}"
+                        f"T{date_str[8:10]}:{date_str[10:12]}:{date_str[12:14]}"
+                    )
+        except Exception:
+            pass
+        return None
     
     async def extract_text_by_pages(self, file_path: Path) -> List[Dict[str, any]]:
         """
@@ -2,10 +2,12 @@
 RAG (Retrieval-Augmented Generation) chatbot service using LangChain and OpenAI.
 Provides context-aware Q&A from uploaded documents.
 """
+import asyncio
 import logging
 from typing import List, Optional, Dict, AsyncGenerator
 from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
 
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
@@ -17,10 +19,14 @@ from app.models import (
     ChatMessage, Timestamp
 )
 from app.services.chunking import chunking_service
-from app.services.vector_store import vector_store
+from app.services.vector_store import get_vector_store
 
 logger = logging.getLogger(__name__)
 
+# Context rendering template (top_k is fixed at 5, so one format call per
+# chunk beats repeated concatenation that churns intermediate strings)
+_CONTEXT_TMPL = "[Source {i}: {name}{page}{ts}]\n{text}\n"
+
 
 class RAGChatService:
     """RAG-based chatbot service."""
@@ -83,22 +89,20 @@ Context will be provided with each question."""
                 request.question
             )
             
-            # Search for relevant chunks
-            filter_meta = {}
+            # Search for relevant chunks, filtering inside the vector store
+            # so restrictive document filters don't eat the top_k budget
+            filter_meta = None
             if request.document_ids:
-                # We'll filter after retrieval since FAISS metadata filtering is limited
-                pass
-            
-            search_results = await vector_store.search(
+                filter_meta = {"document_id": request.document_ids}
+
+            search_results = await get_vector_store().search(
                 query_embedding=query_embedding,
-                top_k=5
+                top_k=5,
+                filter_metadata=filter_meta
             )
-            
+
             # Get full chunk details from database
-            relevant_chunks = await self._get_chunk_details(
-                search_results,
-                request.document_ids
-            )
+            relevant_chunks = await self._get_chunk_details(search_results)
             
             if not relevant_chunks:
                 return ChatResponse(
@@ -170,15 +174,17 @@ Context will be provided with each question."""
                 request.question
             )
             
-            search_results = await vector_store.search(
+            filter_meta = None
+            if request.document_ids:
+                filter_meta = {"document_id": request.document_ids}
+
+            search_results = await get_vector_store().search(
                 query_embedding=query_embedding,
-                top_k=5
-            )
-            
-            relevant_chunks = await self._get_chunk_details(
-                search_results,
-                request.document_ids
+                top_k=5,
+                filter_metadata=filter_meta
             )
+
+            relevant_chunks = await self._get_chunk_details(search_results)
             
             if not relevant_chunks:
                 yield "I don't have any relevant information to answer your question. Please upload relevant documents first."
@@ -190,7 +196,6 @@ Context will be provided with each question."""
             # Check if we're using free LLM (doesn't support native streaming)
             if self.free_llm:
                 # Free LLM generates full response, simulate streaming
-                import asyncio
                 history_dicts = None
                 if request.conversation_history:
                     history_dicts = [
@@ -206,14 +211,18 @@ Context will be provided with each question."""
                     conversation_history=history_dicts
                 )
                 
-                # Simulate streaming by yielding words progressively
+                # Simulate streaming by yielding batches of words. A single
+                # short sleep per batch keeps the UI animation smooth without
+                # adding ~50ms of artificial latency per word
                 words = answer.split()
-                for i, word in enumerate(words):
-                    if i < len(words) - 1:
-                        yield word + " "
+                batch_size = 10
+                for i in range(0, len(words), batch_size):
+                    batch = words[i:i + batch_size]
+                    if i + batch_size < len(words):
+                        yield " ".join(batch) + " "
+                        await asyncio.sleep(0.05)
                     else:
-                        yield word
-                    await asyncio.sleep(0.05)  # Small delay for smooth streaming effect
+                        yield " ".join(batch)
             else:
                 # OpenAI LLM supports native streaming
                 messages = self._build_messages(
@@ -233,19 +242,14 @@ Context will be provided with each question."""
     
     async def _get_chunk_details(
         self,
-        search_results: List[tuple],
-        document_ids: Optional[List[str]] = None
+        search_results: List[tuple]
     ) -> List[Dict]:
         """Get full chunk details from database, filtering by user_id if set."""
         chunks = []
-        
+
         for metadata, score in search_results:
             chunk_id = metadata.get("chunk_id")
-            
-            # Filter by document IDs if specified
-            if document_ids and metadata.get("document_id") not in document_ids:
-                continue
-            
+
             # Get chunk from database
             chunk_data = await self.db.chunks.find_one({"_id": chunk_id})
             if not chunk_data:
@@ -271,27 +275,30 @@ Context will be provided with each question."""
             doc_data = await self.db.documents.find_one(
                 {"_id": chunk["document_id"]}
             )
-            
+
             if not doc_data:
                 continue
-            
-            doc_name = doc_data["metadata"]["file_name"]
-            context_part = f"[Source {i}: {doc_name}"
-            
-            # Add page number if available
+
+            # Precompute optional fields to "" when absent, then render the
+            # whole source header + text in a single format call
+            page = ""
             if chunk["metadata"].get("page_number"):
-                context_part += f", Page {chunk['metadata']['page_number']}"
-            
-            # Add timestamps if available
-            if chunk["metadata"].get("timestamps"):
-                timestamps = chunk["metadata"]["timestamps"]
-                if timestamps:
-                    start_time = timestamps[0]["start"]
-                    context_part += f", Timestamp: {self._format_timestamp(start_time)}"
-            
-            context_part += "]\n" + chunk["text"] + "\n"
-            context_parts.append(context_part)
-        
+                page = f", Page {chunk['metadata']['page_number']}"
+
+            ts = ""
+            timestamps = chunk["metadata"].get("timestamps")
+            if timestamps:
+                start_time = timestamps[0]["start"]
+                ts = f", Timestamp: {self._format_timestamp(start_time)}"
+
+            context_parts.append(_CONTEXT_TMPL.format_map({
+                "i": i,
+                "name": doc_data["metadata"]["file_name"],
+                "page": page,
+                "ts": ts,
+                "text": chunk["text"],
+            }))
+
         return "\n".join(context_parts)
     
     def _build_messages(
@@ -383,33 +390,8 @@ Answer based only on the context above:"""
             Summary text
         """
         try:
-            # Get document
-            doc_data = await self.db.documents.find_one({"_id": document_id})
-            if not doc_data:
-                raise ValueError(f"Document not found: {document_id}")
-            
-            # Get content
-            content = doc_data.get("extracted_text") or doc_data.get("transcription")
-            if not content:
-                raise ValueError("No content available to summarize")
-            
-            # Truncate if too long (to fit in context window)
-            if len(content) > 10000:
-                content = content[:10000] + "..."
-            
-            # Create summary prompt
-            prompt = f"""Summarize the following document in approximately {max_length} words. Focus on the main points and key information.
-
-Document: {doc_data['metadata']['file_name']}
+            summary = await self._generate_summary(document_id, max_length)
 
-Content:
-{content}
-
-Summary:"""
-            
-            response = await self.llm.ainvoke([HumanMessage(content=prompt)])
-            summary = response.content
-            
             # Update document with summary
             await self.db.documents.update_one(
                 {"_id": document_id},
@@ -418,10 +400,101 @@ Summary:"""
                     "updated_at": datetime.utcnow()
                 }}
             )
-            
+
             logger.info(f"Generated summary for document {document_id}")
             return summary
-            
+
         except Exception as e:
             logger.error(f"Summarization failed: {e}")
             raise
+
+    async def summarize_documents(
+        self,
+        document_ids: List[str],
+        max_length: int = 500,
+        max_concurrency: int = 5
+    ) -> Dict[str, str]:
+        """
+        Generate summaries for multiple documents in one batch.
+
+        Summaries are generated concurrently (bounded by a semaphore) and
+        written back with a single bulk_write instead of one round-trip
+        per document.
+
+        Args:
+            document_ids: Document IDs to summarize
+            max_length: Maximum summary length in words
+            max_concurrency: Maximum concurrent LLM calls
+
+        Returns:
+            Mapping of document_id to summary text
+        """
+        if not document_ids:
+            return {}
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _summarize(document_id: str) -> Optional[str]:
+            async with semaphore:
+                try:
+                    return await self._generate_summary(document_id, max_length)
+                except Exception as e:
+                    logger.error(f"Summarization failed for {document_id}: {e}")
+                    return None
+
+        summaries = await asyncio.gather(
+            *(_summarize(doc_id) for doc_id in document_ids)
+        )
+
+        # One timestamp for the whole batch, one bulk write for all updates
+        now = datetime.utcnow()
+        results = {
+            doc_id: summary
+            for doc_id, summary in zip(document_ids, summaries)
+            if summary is not None
+        }
+
+        if results:
+            await self.db.documents.bulk_write([
+                UpdateOne(
+                    {"_id": doc_id},
+                    {"$set": {"summary": summary, "updated_at": now}}
+                )
+                for doc_id, summary in results.items()
+            ])
+
+        logger.info(f"Generated summaries for {len(results)}/{len(document_ids)} documents")
+        return results
+
+    async def _generate_summary(
+        self,
+        document_id: str,
+        max_length: int = 500
+    ) -> str:
+        """Generate a summary for one document without persisting it."""
+        # Get document
+        doc_data = await self.db.documents.find_one({"_id": document_id})
+        if not doc_data:
+            raise ValueError(f"Document not found: {document_id}")
+
+        # Get content
+        content = doc_data.get("extracted_text") or doc_data.get("transcription")
+        if not content:
+            raise ValueError("No content available to summarize")
+
+        # Truncate if too long (to fit in context window)
+        if len(content) > 10000:
+            content = content[:10000] + "..."
+
+        # Create summary prompt
+        prompt = f"""Summarize the following document in approximately {max_length} words. Focus on the main points and key information.
+
+Document: {doc_data['metadata']['file_name']}
+
+Content:
+{content}
+
+Summary:"""
+
+        response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+        return response.content
@@ -6,11 +6,11 @@ import logging
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
+import httpx
 import openai
 from openai import AsyncOpenAI
 from pydub import AudioSegment
-import tempfile
-import os
+import io
 
 from app.core.config import settings
 from app.models import Timestamp
@@ -29,7 +29,25 @@ class TranscriptionService:
     
     def __init__(self):
         """Initialize transcription service."""
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        # Shared HTTP/2 client with a generous keep-alive pool so concurrent
+        # chunk uploads multiplex over one TLS connection instead of paying
+        # connection setup per API call
+        self._http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=50,
+                max_keepalive_connections=50
+            ),
+            timeout=600
+        )
+        self.client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            http_client=self._http_client
+        )
+
+    async def aclose(self):
+        """Close the shared HTTP client."""
+        await self._http_client.aclose()
     
     async def transcribe(
         self, 
@@ -89,28 +107,41 @@ class TranscriptionService:
         offset: float = 0.0
     ) -> Tuple[str, List[Timestamp]]:
         """Transcribe a single file using Whisper API."""
+        with open(file_path, 'rb') as audio_file:
+            return await self._transcribe_fileobj(audio_file, language, offset)
+
+    async def _transcribe_fileobj(
+        self,
+        audio_file,
+        language: Optional[str] = None,
+        offset: float = 0.0
+    ) -> Tuple[str, List[Timestamp]]:
+        """Transcribe an open file-like object using Whisper API."""
         try:
-            with open(file_path, 'rb') as audio_file:
-                # Use verbose_json response format to get timestamps
-                response = await self.client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    response_format="verbose_json",
-                    language=language
-                )
-            
+            # Use verbose_json response format to get timestamps
+            response = await self.client.audio.transcriptions.create(
+                model="whisper-1",
+                file=audio_file,
+                response_format="verbose_json",
+                language=language
+            )
+
             # Extract full text
             transcription_text = response.text
             
-            # Extract timestamps from segments
+            # Extract timestamps from segments. Whisper data is already
+            # well-formed, so model_construct skips per-segment validation
+            # (thousands of segments on long files)
             timestamps = []
             if hasattr(response, 'segments') and response.segments:
-                for segment in response.segments:
-                    timestamps.append(Timestamp(
+                timestamps = [
+                    Timestamp.model_construct(
                         start=segment['start'] + offset,
                         end=segment['end'] + offset,
                         text=segment['text'].strip()
-                    ))
+                    )
+                    for segment in response.segments
+                ]
             
             return transcription_text, timestamps
             
@@ -142,32 +173,25 @@ class TranscriptionService:
                 
                 # Extract chunk
                 chunk = audio[start_ms:end_ms]
-                
-                # Save to temporary file
-                with tempfile.NamedTemporaryFile(
-                    suffix=".mp3",
-                    delete=False
-                ) as temp_file:
-                    chunk.export(temp_file.name, format="mp3")
-                    temp_path = Path(temp_file.name)
-                
-                try:
-                    # Transcribe chunk
-                    offset_seconds = start_ms / 1000.0
-                    text, timestamps = await self._transcribe_file(
-                        temp_path,
-                        language,
-                        offset=offset_seconds
-                    )
-                    
-                    all_text.append(text)
-                    all_timestamps.extend(timestamps)
-                    
-                finally:
-                    # Clean up temp file
-                    if temp_path.exists():
-                        temp_path.unlink()
-                
+
+                # Export to an in-memory buffer instead of round-tripping
+                # each chunk through a temp file on disk
+                buffer = io.BytesIO()
+                chunk.export(buffer, format="mp3")
+                buffer.seek(0)
+                buffer.name = f"chunk_{i}.mp3"  # OpenAI SDK uses .name for content type
+
+                # Transcribe chunk
+                offset_seconds = start_ms / 1000.0
+                text, timestamps = await self._transcribe_fileobj(
+                    buffer,
+                    language,
+                    offset=offset_seconds
+                )
+
+                all_text.append(text)
+                all_timestamps.extend(timestamps)
+
                 logger.info(f"Chunk {i+1}/{chunk_count} completed")
             
             # Combine results
@@ -4,12 +4,15 @@ Unified transcription service supporting multiple providers:
 - OpenAI Whisper API (paid, best quality)
 - Deepgram (paid, fastest)
 """
+import asyncio
 import logging
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
 from datetime import datetime
-import tempfile
-import os
+
+import aiofiles
+import httpx
+import numpy as np
 
 from app.core.config import settings
 from app.models import Timestamp
@@ -60,16 +63,17 @@ class UnifiedTranscriptionService:
     
     async def transcribe(
         self,
-        file_path: Path,
+        file_path: Union[Path, AsyncIterator[bytes]],
         language: Optional[str] = None
     ) -> Tuple[str, List[Timestamp], Dict]:
         """
         Transcribe audio/video file with timestamps.
-        
+
         Args:
-            file_path: Path to audio/video file
+            file_path: Path to audio/video file. The deepgram provider
+                also accepts an async byte iterator (streamed upload)
             language: Optional language code (e.g., 'en', 'es')
-            
+
         Returns:
             Tuple of (full_transcription, timestamps, metadata)
         """
@@ -80,160 +84,246 @@ class UnifiedTranscriptionService:
             logger.error(f"Transcription failed with {self.provider}: {e}")
             raise
     
+    async def aclose(self):
+        """Release provider resources (e.g. pooled HTTP connections)."""
+        if hasattr(self._service, "aclose"):
+            await self._service.aclose()
+
     async def extract_audio_from_video(self, video_path: Path) -> Path:
-        """Extract audio track from video file."""
+        """Extract audio track from video file using ffmpeg."""
         try:
-            from moviepy.editor import VideoFileClip
-            
-            # Create temp audio file
-            audio_path = video_path.with_suffix('.mp3')
-            
-            with VideoFileClip(str(video_path)) as video:
-                if video.audio is None:
-                    raise ValueError("Video file has no audio track")
-                
-                video.audio.write_audiofile(
-                    str(audio_path),
-                    logger=None  # Suppress moviepy logs
+            # Try a lossless stream copy first: ffmpeg remuxes the audio
+            # track without decoding, so extraction is I/O-bound
+            audio_path = video_path.with_suffix('.m4a')
+            returncode = await self._run_ffmpeg(
+                "-i", str(video_path), "-vn", "-acodec", "copy",
+                str(audio_path)
+            )
+
+            if returncode != 0 or not audio_path.exists():
+                # Codec/container mismatch: fall back to an mp3 re-encode
+                if audio_path.exists():
+                    audio_path.unlink()
+                audio_path = video_path.with_suffix('.mp3')
+                returncode = await self._run_ffmpeg(
+                    "-i", str(video_path), "-vn",
+                    "-acodec", "libmp3lame", "-q:a", "4",
+                    str(audio_path)
                 )
-            
+                if returncode != 0:
+                    raise ValueError(
+                        "ffmpeg failed to extract audio (video may have no audio track)"
+                    )
+
             logger.info(f"Audio extracted from video: {audio_path}")
             return audio_path
-            
+
         except Exception as e:
             logger.error(f"Failed to extract audio from video: {e}")
             raise
 
+    async def stream_audio_from_video(
+        self, video_path: Path
+    ) -> AsyncIterator[bytes]:
+        """Stream a video's audio track as mp3 bytes from ffmpeg stdout.
+
+        Avoids writing an intermediate audio file to disk; backends that
+        accept an async byte iterator (Deepgram) can upload the stream
+        directly with chunked transfer encoding.
+        """
+        proc = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-i", str(video_path), "-vn", "-f", "mp3", "-",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        drained = False
+        try:
+            while True:
+                chunk = await proc.stdout.read(1 << 16)
+                if not chunk:
+                    drained = True
+                    break
+                yield chunk
+        finally:
+            if not drained:
+                # Consumer closed the stream early (e.g. the upload was
+                # rejected mid-transfer); ffmpeg is blocked writing into
+                # the full pipe and would never exit on its own
+                proc.kill()
+            await proc.wait()
+
+    @staticmethod
+    async def _run_ffmpeg(*args: str) -> int:
+        """Run ffmpeg with the given arguments, returning its exit code."""
+        proc = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-y", *args,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        return await proc.wait()
+
 
 class DeepgramTranscriptionService:
-    """Service for transcribing audio/video using Deepgram API."""
-    
+    """Service for transcribing audio/video using the Deepgram REST API."""
+
+    API_URL = "https://api.deepgram.com/v1/listen"
+
     def __init__(self):
-        """Initialize Deepgram client."""
-        from deepgram import DeepgramClient, PrerecordedOptions
-        
-        self.client = DeepgramClient(settings.DEEPGRAM_API_KEY)
-        self.PrerecordedOptions = PrerecordedOptions
+        """Initialize a persistent async HTTP client for Deepgram."""
+        # Keep-alive connection reused across transcriptions so each call
+        # doesn't pay a fresh TCP+TLS handshake
+        self._http = httpx.AsyncClient(
+            timeout=httpx.Timeout(600),
+            headers={"Authorization": f"Token {settings.DEEPGRAM_API_KEY}"}
+        )
         logger.info("Deepgram client initialized")
-    
+
+    async def aclose(self):
+        """Close the shared HTTP client."""
+        await self._http.aclose()
+
+    @staticmethod
+    async def _stream_file(path: Path) -> AsyncIterator[bytes]:
+        """Yield a file's bytes in 64 KB chunks without loading it all."""
+        async with aiofiles.open(path, 'rb') as f:
+            while chunk := await f.read(1 << 16):
+                yield chunk
+
+    @staticmethod
+    def _group_words_into_sentences(words: List[Dict]) -> List[Timestamp]:
+        """Group word-level timings into approximate sentences.
+
+        A sentence ends at the first word carrying terminal punctuation
+        or after 20 words, whichever comes first. Boundaries are found
+        with a precomputed punctuation mask and searchsorted, so the
+        scan is O(sentences) instead of a per-word Python loop — this
+        sits on the critical path for transcripts with 10k+ words.
+        """
+        n = len(words)
+        starts = np.fromiter((w["start"] for w in words), dtype=np.float64, count=n)
+        ends = np.fromiter((w["end"] for w in words), dtype=np.float64, count=n)
+        texts = [w["word"] for w in words]
+        punct_indices = np.flatnonzero(np.fromiter(
+            (t.endswith(('.', '!', '?')) for t in texts), dtype=bool, count=n
+        ))
+
+        timestamps = []
+        i = 0
+        while i < n:
+            pos = np.searchsorted(punct_indices, i)
+            j = punct_indices[pos] if pos < len(punct_indices) else n - 1
+            # The 20-word cap resets at every boundary, so it can't be a
+            # single global mask; min() applies it per sentence
+            j = min(int(j), i + 19)
+            timestamps.append(Timestamp.model_construct(
+                start=float(starts[i]),
+                end=float(ends[j]),
+                text=' '.join(texts[i:j + 1])
+            ))
+            i = j + 1
+
+        return timestamps
+
     async def transcribe(
         self,
-        file_path: Path,
+        file_path: Union[Path, AsyncIterator[bytes]],
         language: Optional[str] = None
     ) -> Tuple[str, List[Timestamp], Dict]:
         """
-        Transcribe audio/video file using Deepgram.
-        
+        Transcribe audio/video using Deepgram.
+
         Args:
-            file_path: Path to audio/video file
+            file_path: Path to audio/video file, or an async byte iterator
+                (e.g. stream_audio_from_video) uploaded with chunked
+                transfer encoding without buffering the whole file
             language: Optional language code (e.g., 'en', 'es')
-            
+
         Returns:
             Tuple of (full_transcription, timestamps, metadata)
         """
         try:
             logger.info(f"Transcribing with Deepgram: {file_path}")
-            
-            # Read audio file
-            with open(file_path, 'rb') as audio_file:
-                buffer_data = audio_file.read()
-            
-            # Configure options
-            options = self.PrerecordedOptions(
-                model="nova-2",  # Latest model
-                smart_format=True,
-                punctuate=True,
-                paragraphs=True,
-                utterances=True,
-                language=language or "en",
-            )
-            
-            # Transcribe using prerecorded method
-            payload = {"buffer": buffer_data}
-            response = self.client.listen.prerecorded.v("1").transcribe_file(
-                payload,
-                options
+
+            if isinstance(file_path, Path):
+                # Stream the file in 64 KB chunks so peak memory stays
+                # bounded regardless of audio size
+                content = self._stream_file(file_path)
+            else:
+                # httpx streams async iterators as a chunked request body
+                content = file_path
+
+            # Async REST call through the pooled client
+            response = await self._http.post(
+                self.API_URL,
+                params={
+                    "model": "nova-2",  # Latest model
+                    "smart_format": "true",
+                    "punctuate": "true",
+                    "paragraphs": "true",
+                    "utterances": "true",
+                    "language": language or "en",
+                },
+                content=content,
+                headers={"Content-Type": "audio/*"}
             )
-            
+            response.raise_for_status()
+            payload = response.json()
+
             # Extract transcription
-            if not response.results or not response.results.channels:
+            channels = payload.get("results", {}).get("channels") or []
+            if not channels:
                 raise ValueError("No transcription results from Deepgram")
-            
-            channel = response.results.channels[0]
-            
+
+            alternative = channels[0]["alternatives"][0]
+
             # Get full text
-            transcription_text = channel.alternatives[0].transcript
-            
+            transcription_text = alternative.get("transcript", "")
+
             # Extract timestamps from paragraphs or words
             timestamps = []
-            
-            # Try to use paragraphs first
-            if hasattr(channel.alternatives[0], 'paragraphs') and channel.alternatives[0].paragraphs:
-                paragraphs_list = channel.alternatives[0].paragraphs.paragraphs if hasattr(channel.alternatives[0].paragraphs, 'paragraphs') else []
-                for paragraph in paragraphs_list:
-                    # Deepgram paragraphs have 'sentences' array, not 'text' directly
-                    para_text = ""
-                    if hasattr(paragraph, 'sentences'):
-                        para_text = ' '.join([s.text for s in paragraph.sentences if hasattr(s, 'text')])
-                    elif hasattr(paragraph, 'text'):
-                        para_text = paragraph.text
-                    
-                    if para_text:
-                        timestamps.append(Timestamp(
-                            start=paragraph.start if hasattr(paragraph, 'start') else 0,
-                            end=paragraph.end if hasattr(paragraph, 'end') else 0,
-                            text=para_text.strip()
-                        ))
-            
-            # Fallback to words if no paragraphs
-            if not timestamps and hasattr(channel.alternatives[0], 'words') and channel.alternatives[0].words:
-                # Group words into sentences (approximate)
-                sentence_words = []
-                sentence_start = None
-                
-                for word in channel.alternatives[0].words:
-                    if sentence_start is None:
-                        sentence_start = word.start
-                    
-                    sentence_words.append(word.word)
-                    
-                    # End sentence on punctuation or every 20 words
-                    if (word.word.endswith(('.', '!', '?')) or 
-                        len(sentence_words) >= 20):
-                        timestamps.append(Timestamp(
-                            start=sentence_start,
-                            end=word.end,
-                            text=' '.join(sentence_words)
-                        ))
-                        sentence_words = []
-                        sentence_start = None
-                
-                # Add remaining words
-                if sentence_words:
-                    last_word = channel.alternatives[0].words[-1]
+
+            # Try to use paragraphs first; probe the nested structure once
+            # instead of re-resolving it per paragraph
+            paragraphs_obj = alternative.get("paragraphs")
+            paragraphs_list = (
+                paragraphs_obj.get("paragraphs") if paragraphs_obj else None
+            ) or []
+            for paragraph in paragraphs_list:
+                # Deepgram paragraphs have a 'sentences' array, not 'text' directly
+                sentences = paragraph.get("sentences")
+                para_text = (
+                    ' '.join(s.get("text", "") for s in sentences)
+                    if sentences else paragraph.get("text", "")
+                )
+                if para_text:
                     timestamps.append(Timestamp(
-                        start=sentence_start or last_word.start,
-                        end=last_word.end,
-                        text=' '.join(sentence_words)
+                        start=paragraph.get("start", 0),
+                        end=paragraph.get("end", 0),
+                        text=para_text.strip()
                     ))
-            
+
+            # Fallback to words if no paragraphs
+            words = alternative.get("words") or []
+            if not timestamps and words:
+                timestamps = self._group_words_into_sentences(words)
+
             # Metadata
             metadata = {
                 "provider": "deepgram",
                 "model": "nova-2",
                 "language": language or "en",
-                "duration": response.metadata.duration if hasattr(response, 'metadata') else 0,
+                "duration": payload.get("metadata", {}).get("duration", 0),
                 "segments": len(timestamps),
-                "confidence": channel.alternatives[0].confidence if hasattr(channel.alternatives[0], 'confidence') else None
+                "confidence": alternative.get("confidence")
             }
-            
+
             logger.info(
                 f"Deepgram transcription complete: {len(transcription_text)} chars, "
                 f"{len(timestamps)} segments"
             )
-            
+
             return transcription_text, timestamps, metadata
-            
+
         except Exception as e:
             logger.error(f"Deepgram transcription failed: {e}")
             raise
@@ -2,10 +2,13 @@
 Vector store service using FAISS for semantic search.
 Manages embeddings and similarity search operations.
 """
+import asyncio
 import logging
+import os
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Union
 import pickle
+import msgpack
 import numpy as np
 import faiss
 from datetime import datetime
@@ -17,7 +20,11 @@ logger = logging.getLogger(__name__)
 
 class FAISSVectorStore:
     """FAISS-based vector store for similarity search."""
-    
+
+    # Delay before a scheduled save hits disk; adds arriving in between
+    # coalesce into the same save
+    SAVE_DEBOUNCE_SECONDS = 5.0
+
     def __init__(self):
         """Initialize FAISS vector store."""
         self.index: Optional[faiss.Index] = None
@@ -30,26 +37,79 @@ class FAISSVectorStore:
             
         self.index_path = Path(settings.FAISS_INDEX_PATH)
         self.index_path.mkdir(parents=True, exist_ok=True)
-        
-        # Metadata storage (maps index position to document/chunk info)
-        self.metadata: List[Dict] = []
-        
+
+        # Metadata storage (maps vector ID to document/chunk info)
+        self.metadata: Dict[int, Dict] = {}
+        self._next_id = 0
+
+        # Inverted index for the common document_id filter: lets search
+        # mask candidates with one np.isin instead of a per-hit dict walk
+        self._doc_to_ids: Dict[str, List[int]] = {}
+
+        # Debounced persistence state
+        self._save_task: Optional[asyncio.Task] = None
+        self._dirty = False
+
+        # True while the index is a read-only memory map
+        self._mmap_index = False
+
         # Load existing index if available
         self._load_index()
+        self._build_doc_index()
+
+        # Let batched searches (and IVF training) fan out across cores;
+        # one core is left free for the event loop unless overridden
+        num_threads = settings.FAISS_NUM_THREADS or max(1, (os.cpu_count() or 2) - 1)
+        faiss.omp_set_num_threads(num_threads)
+        logger.info(f"FAISS using {num_threads} threads")
     
     def _load_index(self):
         """Load existing FAISS index from disk."""
         index_file = self.index_path / "index.faiss"
-        metadata_file = self.index_path / "metadata.pkl"
-        
-        if index_file.exists() and metadata_file.exists():
+        metadata_file = self.index_path / "metadata.msgpack"
+        legacy_metadata_file = self.index_path / "metadata.pkl"
+
+        if index_file.exists() and (
+            metadata_file.exists() or legacy_metadata_file.exists()
+        ):
             try:
-                self.index = faiss.read_index(str(index_file))
-                with open(metadata_file, 'rb') as f:
-                    self.metadata = pickle.load(f)
-                
+                try:
+                    # Map the index instead of materializing it: the OS
+                    # pages vectors in on demand, so cold boot is fast and
+                    # startup RSS stays near zero for large stores
+                    self.index = faiss.read_index(
+                        str(index_file),
+                        faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+                    )
+                    self._mmap_index = True
+                except RuntimeError:
+                    # Not every index type supports mem-mapping
+                    self.index = faiss.read_index(str(index_file))
+
+                if metadata_file.exists():
+                    with open(metadata_file, 'rb') as f:
+                        stored = msgpack.unpackb(f.read(), strict_map_key=False)
+                    self.metadata = {
+                        int(k): v for k, v in stored["metadata"].items()
+                    }
+                    self._next_id = stored["next_id"]
+                else:
+                    # Legacy pickle formats from before the msgpack switch
+                    with open(legacy_metadata_file, 'rb') as f:
+                        stored = pickle.load(f)
+
+                    if isinstance(stored, list):
+                        # Positional metadata list from before the IDMap2
+                        # migration
+                        self.metadata = dict(enumerate(stored))
+                        self._next_id = len(stored)
+                    else:
+                        self.metadata = stored["metadata"]
+                        self._next_id = stored["next_id"]
+
                 logger.info(
-                    f"Loaded FAISS index with {self.index.ntotal} vectors, dimension={self.index.d}"
+                    "Loaded FAISS index with %s vectors, dimension=%s",
+                    self.index.ntotal, self.index.d
                 )
             except Exception as e:
                 logger.error(f"Failed to load FAISS index: {e}")
@@ -58,87 +118,167 @@ class FAISSVectorStore:
             self._initialize_index()
     
     def _initialize_index(self):
-        """Initialize a new FAISS index."""
-        # Use IndexFlatIP for cosine similarity (inner product)
-        # We'll normalize vectors before adding them
-        self.index = faiss.IndexFlatIP(self.dimension)
-        self.metadata = []
-        logger.info(f"Initialized new FAISS index with dimension {self.dimension}, index.d={self.index.d}")
+        """Initialize a new FAISS index.
+
+        All index types use inner product over normalized vectors (cosine
+        similarity). The type is controlled by settings.FAISS_INDEX_TYPE:
+        - "hnsw" (default): graph index, sublinear search, no training
+        - "ivf": inverted lists, trained on the first batch
+        - "sq8": int8 scalar quantizer, 4x smaller and less memory traffic
+          than flat for a small recall cost, trained on the first batch
+        - "flat": exhaustive scan, exact results (fine for small corpora)
+        """
+        index_type = settings.FAISS_INDEX_TYPE
+
+        if index_type == "hnsw":
+            self.index = faiss.IndexHNSWFlat(
+                self.dimension, 32, faiss.METRIC_INNER_PRODUCT
+            )
+            self.index.hnsw.efConstruction = 200
+            self.index.hnsw.efSearch = 64
+        elif index_type == "ivf":
+            quantizer = faiss.IndexFlatIP(self.dimension)
+            self.index = faiss.IndexIVFFlat(
+                quantizer, self.dimension, 100, faiss.METRIC_INNER_PRODUCT
+            )
+            self.index.nprobe = 10
+        elif index_type == "sq8":
+            self.index = faiss.IndexScalarQuantizer(
+                self.dimension,
+                faiss.ScalarQuantizer.QT_8bit,
+                faiss.METRIC_INNER_PRODUCT
+            )
+        else:
+            self.index = faiss.IndexFlatIP(self.dimension)
+
+        # Wrap with IDMap2 so vectors carry stable int64 IDs: deletion can
+        # use remove_ids instead of rebuilding, and IDs survive deletions
+        self.index = faiss.IndexIDMap2(self.index)
+
+        self.metadata = {}
+        self._next_id = 0
+        logger.info(
+            f"Initialized new FAISS index ({index_type}) with dimension {self.dimension}, "
+            f"index.d={self.index.d}"
+        )
     
+    def _build_doc_index(self):
+        """Rebuild the document_id -> vector IDs inverted index."""
+        self._doc_to_ids = {}
+        for vec_id, meta in self.metadata.items():
+            doc_id = meta.get("document_id")
+            if doc_id is not None:
+                self._doc_to_ids.setdefault(doc_id, []).append(vec_id)
+
+    def _ensure_writable(self):
+        """Swap a mem-mapped index for an in-memory copy before mutating."""
+        if self._mmap_index:
+            self.index = faiss.read_index(str(self.index_path / "index.faiss"))
+            self._mmap_index = False
+            logger.info("Promoted mem-mapped FAISS index to writable copy")
+
     def save_index(self):
         """Save FAISS index to disk."""
         try:
             index_file = self.index_path / "index.faiss"
-            metadata_file = self.index_path / "metadata.pkl"
-            
+            metadata_file = self.index_path / "metadata.msgpack"
+
             faiss.write_index(self.index, str(index_file))
-            
+
+            # msgpack serializes the flat metadata dicts without pickle's
+            # object-graph traversal and is safe to load
             with open(metadata_file, 'wb') as f:
-                pickle.dump(self.metadata, f)
+                f.write(msgpack.packb(
+                    {"metadata": self.metadata, "next_id": self._next_id}
+                ))
             
             logger.info(f"Saved FAISS index with {self.index.ntotal} vectors")
             
         except Exception as e:
             logger.error(f"Failed to save FAISS index: {e}")
             raise
-    
-    def _normalize_vector(self, vector: np.ndarray) -> np.ndarray:
-        """Normalize vector for cosine similarity."""
-        norm = np.linalg.norm(vector)
-        if norm == 0:
-            return vector
-        return vector / norm
-    
+
+    def _schedule_save(self):
+        """Schedule a debounced save so ingest bursts don't block on disk."""
+        self._dirty = True
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.get_running_loop().create_task(
+                self._debounced_save()
+            )
+
+    async def _debounced_save(self):
+        """Wait out the debounce window, then save off the event loop."""
+        while self._dirty:
+            await asyncio.sleep(self.SAVE_DEBOUNCE_SECONDS)
+            self._dirty = False
+            await asyncio.to_thread(self.save_index)
+
     async def add_vectors(
         self,
-        embeddings: List[List[float]],
+        embeddings: Union[List[List[float]], np.ndarray],
         metadata: List[Dict]
     ):
         """
         Add vectors to the index.
-        
+
         Args:
-            embeddings: List of embedding vectors
+            embeddings: Embedding matrix (ndarray) or list of embedding vectors
             metadata: List of metadata dicts (one per embedding)
         """
-        if not embeddings or not metadata:
+        if len(embeddings) == 0 or not metadata:
             logger.warning("No embeddings or metadata to add")
             return
-        
+
         if len(embeddings) != len(metadata):
             raise ValueError("Number of embeddings must match number of metadata entries")
-        
+
         try:
-            logger.info(f"Converting {len(embeddings)} embeddings to numpy array")
-            logger.info(f"First embedding shape: {len(embeddings[0])}")
-            
-            # Convert to numpy array and normalize
-            vectors = np.array(embeddings, dtype=np.float32)
-            logger.info(f"Numpy array shape: {vectors.shape}, dtype: {vectors.dtype}")
-            logger.info(f"Expected dimension: {self.dimension}, actual dimension: {vectors.shape[1]}")
-            
+            self._ensure_writable()
+
+            # No-copy when the embedding service already hands us a
+            # contiguous float32 matrix; otherwise one conversion
+            vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+            # Lazy %s formatting so per-batch diagnostics cost nothing
+            # when DEBUG is filtered out
+            logger.debug("Numpy array shape: %s dtype: %s", vectors.shape, vectors.dtype)
+
             if vectors.shape[1] != self.dimension:
                 raise ValueError(f"Embedding dimension mismatch: expected {self.dimension}, got {vectors.shape[1]}")
-            
-            logger.info("Normalizing vectors")
-            vectors = np.apply_along_axis(self._normalize_vector, 1, vectors)
-            logger.info(f"Vectors normalized, shape: {vectors.shape}")
-            
-            # Add to index
-            logger.info(f"Adding {len(vectors)} vectors to FAISS index (current total: {self.index.ntotal})")
-            logger.info(f"FAISS index dimension: {self.index.d}, vector dimension: {vectors.shape[1]}")
-            self.index.add(vectors)
-            logger.info(f"Vectors added successfully. New total: {self.index.ntotal}")
-            
+
+            # In-place SIMD batch normalization instead of a per-row Python callback
+            faiss.normalize_L2(vectors)
+
+            # Train on the first batch if the index type requires it (IVF).
+            # FAISS releases the GIL in its C++ kernels, so running them in
+            # a worker thread keeps the event loop responsive
+            if not self.index.is_trained:
+                logger.info("Training FAISS index on %s vectors", len(vectors))
+                await asyncio.to_thread(self.index.train, vectors)
+
+            # Add to index with monotonically increasing IDs
+            logger.debug(
+                "Adding %s vectors to FAISS index (current total: %s)",
+                len(vectors), self.index.ntotal
+            )
+            ids = np.arange(
+                self._next_id, self._next_id + len(vectors), dtype=np.int64
+            )
+            await asyncio.to_thread(self.index.add_with_ids, vectors, ids)
+            self._next_id += len(vectors)
+
             # Add metadata
-            self.metadata.extend(metadata)
-            
-            logger.info(f"Added {len(embeddings)} vectors to index")
-            
-            # Save periodically
-            if self.index.ntotal % 100 == 0:
-                self.save_index()
+            id_list = ids.tolist()
+            self.metadata.update(zip(id_list, metadata))
+            for vec_id, meta in zip(id_list, metadata):
+                doc_id = meta.get("document_id")
+                if doc_id is not None:
+                    self._doc_to_ids.setdefault(doc_id, []).append(vec_id)
+
+            logger.debug("Added %s vectors to index", len(embeddings))
             
+            # Coalesce disk persistence instead of saving inline
+            self._schedule_save()
+
         except Exception as e:
             logger.error(f"Failed to add vectors: {str(e)}", exc_info=True)
             logger.error(f"Error type: {type(e).__name__}")
@@ -157,53 +297,137 @@ class FAISSVectorStore:
         Args:
             query_embedding: Query vector
             top_k: Number of results to return
-            filter_metadata: Optional metadata filters (e.g., {"document_id": "123"})
-            
+            filter_metadata: Optional metadata filters (e.g., {"document_id": "123"}).
+                A list/set/tuple value matches any of its members
+                (e.g., {"document_id": ["123", "456"]})
+
         Returns:
             List of (metadata, similarity_score) tuples
         """
+        results = await self.search_batch(
+            [query_embedding], top_k=top_k, filter_metadata=filter_metadata
+        )
+        return results[0] if results else []
+
+    async def search_batch(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int = 5,
+        filter_metadata: Optional[Dict] = None
+    ) -> List[List[Tuple[Dict, float]]]:
+        """
+        Search for similar vectors for a batch of queries in one FAISS call.
+
+        Args:
+            query_embeddings: Query vectors, shape (B, dimension)
+            top_k: Number of results per query
+            filter_metadata: Optional metadata filters applied to every query
+
+        Returns:
+            One list of (metadata, similarity_score) tuples per query
+        """
+        if not query_embeddings:
+            return []
+
         if self.index.ntotal == 0:
             logger.warning("Index is empty, cannot search")
-            return []
-        
+            return [[] for _ in query_embeddings]
+
         try:
-            # Normalize query vector
-            query_vector = np.array([query_embedding], dtype=np.float32)
-            query_vector = np.apply_along_axis(
-                self._normalize_vector, 1, query_vector
+            # Normalize all query vectors in one pass
+            query_vectors = np.array(query_embeddings, dtype=np.float32)
+            faiss.normalize_L2(query_vectors)
+
+            # Resolve a document_id filter against the inverted index up
+            # front; other keys fall through to the per-hit check below
+            allowed = None
+            residual_filter = filter_metadata
+            if filter_metadata and "document_id" in filter_metadata:
+                doc_filter = filter_metadata["document_id"]
+                doc_ids = (
+                    doc_filter
+                    if isinstance(doc_filter, (list, set, tuple))
+                    else [doc_filter]
+                )
+                id_arrays = [
+                    np.asarray(self._doc_to_ids.get(d, ()), dtype=np.int64)
+                    for d in doc_ids
+                ]
+                allowed = (
+                    np.concatenate(id_arrays) if id_arrays
+                    else np.empty(0, dtype=np.int64)
+                )
+                if allowed.size == 0:
+                    return [[] for _ in query_embeddings]
+                residual_filter = {
+                    k: v for k, v in filter_metadata.items()
+                    if k != "document_id"
+                }
+
+            # Push the document filter into the search kernel: with an
+            # IDSelector FAISS skips non-matching vectors entirely, so
+            # exact top_k comes back without oversampling
+            params = None
+            # Residual keys are still filtered post-hoc, so oversample
+            # only when they are present
+            search_k = top_k * 3 if residual_filter else top_k
+            if allowed is not None:
+                sel = faiss.IDSelectorBatch(allowed)
+                # Params must match the wrapped index type or FAISS
+                # rejects them ("params type invalid")
+                if settings.FAISS_INDEX_TYPE == "ivf":
+                    params = faiss.SearchParametersIVF(sel=sel)
+                elif settings.FAISS_INDEX_TYPE == "hnsw":
+                    params = faiss.SearchParametersHNSW(sel=sel)
+                else:
+                    params = faiss.SearchParameters(sel=sel)
+
+            # One C call for the whole batch amortizes index traversal.
+            # Run it off the event loop; FAISS drops the GIL so other
+            # coroutines progress while distances are computed
+            distances, indices = await asyncio.to_thread(
+                self.index.search, query_vectors, search_k, params=params
             )
-            
-            # Search
-            # Get more results if filtering is needed
-            search_k = top_k * 3 if filter_metadata else top_k
-            distances, indices = self.index.search(query_vector, search_k)
-            
-            # Collect results
-            results = []
-            for i, idx in enumerate(indices[0]):
-                if idx == -1:  # FAISS returns -1 for missing results
-                    continue
-                
-                meta = self.metadata[idx]
-                score = float(distances[0][i])
-                
-                # Apply filters
-                if filter_metadata:
-                    match = all(
-                        meta.get(k) == v
-                        for k, v in filter_metadata.items()
-                    )
-                    if not match:
+
+            # FAISS returns -1 for missing results
+            valid = indices != -1
+
+            # Collect results per query
+            batch_results = []
+            for row, (row_distances, row_indices) in enumerate(
+                zip(distances, indices)
+            ):
+                results = []
+                for i in np.flatnonzero(valid[row]):
+                    meta = self.metadata.get(int(row_indices[i]))
+                    if meta is None:
                         continue
-                
-                results.append((meta, score))
-                
-                if len(results) >= top_k:
-                    break
-            
-            logger.info(f"Found {len(results)} similar vectors")
-            return results
-            
+
+                    # Apply remaining filters (list values match any member)
+                    if residual_filter:
+                        match = all(
+                            meta.get(k) in v
+                            if isinstance(v, (list, set, tuple))
+                            else meta.get(k) == v
+                            for k, v in residual_filter.items()
+                        )
+                        if not match:
+                            continue
+
+                    results.append((meta, float(row_distances[i])))
+
+                    if len(results) >= top_k:
+                        break
+
+                batch_results.append(results)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Found %s similar vectors for %s queries",
+                    sum(len(r) for r in batch_results), len(batch_results)
+                )
+            return batch_results
+
         except Exception as e:
             logger.error(f"Search failed: {e}")
             raise
@@ -211,43 +435,60 @@ class FAISSVectorStore:
     async def delete_by_document_id(self, document_id: str):
         """
         Delete all vectors for a document.
-        
-        Note: FAISS doesn't support deletion, so we rebuild the index.
+
+        Uses remove_ids on the IDMap2-wrapped index (single C++ pass).
+        Index types that don't support removal (HNSW) fall back to a
+        rebuild of the surviving vectors.
         """
         try:
-            # Find indices to keep
-            indices_to_keep = [
-                i for i, meta in enumerate(self.metadata)
-                if meta.get("document_id") != document_id
-            ]
-            
-            if len(indices_to_keep) == len(self.metadata):
+            ids_to_delete = list(self._doc_to_ids.get(document_id, ()))
+
+            if not ids_to_delete:
                 logger.info(f"No vectors found for document {document_id}")
                 return
-            
-            # Rebuild index with remaining vectors
-            logger.info(f"Rebuilding index after deleting document {document_id}")
-            
-            # Get vectors to keep (reconstruct from index)
-            vectors_to_keep = []
-            metadata_to_keep = []
-            
-            for idx in indices_to_keep:
-                # Reconstruct vector from index
-                vector = self.index.reconstruct(idx)
-                vectors_to_keep.append(vector)
-                metadata_to_keep.append(self.metadata[idx])
-            
-            # Reinitialize and add vectors
-            self._initialize_index()
-            if vectors_to_keep:
-                vectors_array = np.array(vectors_to_keep, dtype=np.float32)
-                self.index.add(vectors_array)
-                self.metadata = metadata_to_keep
-            
+
+            self._ensure_writable()
+
+            try:
+                self.index.remove_ids(
+                    faiss.IDSelectorBatch(
+                        np.array(ids_to_delete, dtype=np.int64)
+                    )
+                )
+            except RuntimeError:
+                # HNSW has no remove_ids: rebuild from surviving vectors
+                logger.info(f"Rebuilding index after deleting document {document_id}")
+                delete_set = set(ids_to_delete)
+                surviving_ids = [
+                    vec_id for vec_id in self.metadata
+                    if vec_id not in delete_set
+                ]
+                surviving_metadata = self.metadata
+                next_id = self._next_id
+
+                vectors = [
+                    self.index.reconstruct(vec_id) for vec_id in surviving_ids
+                ]
+
+                self._initialize_index()
+                self._next_id = next_id
+                if vectors:
+                    self.index.add_with_ids(
+                        np.array(vectors, dtype=np.float32),
+                        np.array(surviving_ids, dtype=np.int64)
+                    )
+                self.metadata = surviving_metadata
+
+            for vec_id in ids_to_delete:
+                self.metadata.pop(vec_id, None)
+            self._doc_to_ids.pop(document_id, None)
+
             self.save_index()
-            logger.info(f"Index rebuilt with {self.index.ntotal} vectors")
-            
+            logger.info(
+                f"Deleted {len(ids_to_delete)} vectors for document {document_id}, "
+                f"{self.index.ntotal} remaining"
+            )
+
         except Exception as e:
             logger.error(f"Failed to delete vectors: {e}")
             raise
@@ -257,10 +498,19 @@ class FAISSVectorStore:
         return {
             "total_vectors": self.index.ntotal if self.index else 0,
             "dimension": self.dimension,
-            "index_type": "FAISS IndexFlatIP",
+            "index_type": f"FAISS {type(self.index).__name__}",
             "storage_path": str(self.index_path),
         }
 
 
-# Singleton instance
-vector_store = FAISSVectorStore()
+# Singleton instance, constructed lazily so importing this module doesn't
+# pay the index load / FAISS init (test collection never touches disk)
+_vector_store: Optional[FAISSVectorStore] = None
+
+
+def get_vector_store() -> FAISSVectorStore:
+    """Get or create singleton vector store instance."""
+    global _vector_store
+    if _vector_store is None:
+        _vector_store = FAISSVectorStore()
+    return _vector_store
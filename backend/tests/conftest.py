@@ -18,19 +18,109 @@ os.environ['DATABASE_NAME'] = 'panscience_test'
 @pytest.fixture(scope="session", autouse=True)
 def setup_mocks():
     """Setup all necessary mocks before app initialization."""
-    with patch('motor.motor_asyncio.AsyncIOMotorClient'), \
+    # Seed the lazy vector store singleton so get_vector_store() never
+    # constructs a real FAISS index during tests
+    import app.services.vector_store as vector_store_module
+    mock_store = MagicMock()
+    mock_store.add_vectors = AsyncMock()
+    mock_store.search = AsyncMock(return_value=[])
+    mock_store.delete_by_document_id = AsyncMock()
+    vector_store_module._vector_store = mock_store
+
+    # Patch the client where database.py binds it (from-import), so the
+    # patch holds even though test modules import app.core.* at collection
+    with patch('app.core.database.AsyncIOMotorClient'), \
          patch('app.core.database.db_manager.connect', new_callable=AsyncMock), \
-         patch('app.core.database.db_manager.disconnect', new_callable=AsyncMock), \
-         patch('app.services.vector_store.FAISSVectorStore.add_vectors', new_callable=AsyncMock), \
-         patch('app.services.vector_store.FAISSVectorStore.search', new_callable=AsyncMock):
+         patch('app.core.database.db_manager.disconnect', new_callable=AsyncMock):
         yield
 
+    vector_store_module._vector_store = None
+
+
+@pytest.fixture(scope="session")
+def app(setup_mocks):
+    """Build the FastAPI app once for the whole session."""
+    from app.main import app as fastapi_app
+    return fastapi_app
+
 
 @pytest.fixture(scope="session")
-def client():
-    """Create test client."""
-    from app.main import app
-    return TestClient(app)
+def client(app):
+    """Create test client (single shared app instance for the session).
+
+    Entering the context manager runs the ASGI lifespan startup once for
+    the whole session (and shutdown once at the end), so individual tests
+    reuse the warm app and transport.
+    """
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(autouse=True)
+def _reset_overrides(app):
+    """Clear per-test dependency overrides so tests stay isolated."""
+    yield
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(autouse=True)
+def _auth_override(app):
+    """Bypass JWT auth through a dependency override.
+
+    One override installed per test replaces the per-test
+    with patch('app.api.*.get_current_user', ...) blocks, which paid
+    attribute lookup, mock construction, and teardown on every call.
+    """
+    from app.core.auth import User
+    from app.core.dependencies import get_current_active_user
+
+    test_user = User(
+        _id="test_user_123",
+        email="test@example.com",
+        full_name="Test User"
+    )
+    app.dependency_overrides[get_current_active_user] = lambda: test_user
+    yield
+    app.dependency_overrides.pop(get_current_active_user, None)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _fast_password_hashing():
+    """Drop bcrypt to its minimum cost factor for the whole test session.
+
+    The auth tests check the hash round-trip, not its work factor, and
+    the default 12 rounds cost a few hundred ms per hash.
+    """
+    from app.core import auth
+
+    auth.pwd_context.update(bcrypt__rounds=4)
+    yield
+    auth.pwd_context.update(bcrypt__rounds=None)
+
+
+@pytest.fixture(scope="session")
+def upload_service():
+    """Shared FileUploadService instance (stateless, so one per session)."""
+    from app.services.file_upload import FileUploadService
+    return FileUploadService()
+
+
+@pytest.fixture(scope="session")
+def valid_token():
+    """A valid access token, signed once for the whole session."""
+    from app.core.auth import create_access_token
+    return create_access_token({"sub": "testuser@example.com"})
+
+
+@pytest.fixture(scope="session")
+def expired_token():
+    """An already-expired access token, signed once for the whole session."""
+    from datetime import timedelta
+    from app.core.auth import create_access_token
+    return create_access_token(
+        {"sub": "test@example.com"},
+        expires_delta=timedelta(seconds=-1)
+    )
 
 
 @pytest.fixture
@@ -41,20 +131,30 @@ def auth_headers():
     return {"Authorization": f"Bearer {token}"}
 
 
+@pytest.fixture(scope="session")
+def _mock_database_instance():
+    """Build the database mock tree once per session."""
+    mock_db = MagicMock()
+    mock_collection = MagicMock()
+    mock_collection.find.return_value.to_list = AsyncMock(return_value=[])
+    mock_collection.find_one = AsyncMock(return_value=None)
+    mock_collection.insert_one = AsyncMock(return_value=MagicMock(inserted_id="test_id"))
+    mock_collection.update_one = AsyncMock()
+    mock_collection.delete_one = AsyncMock()
+    mock_collection.count_documents = AsyncMock(return_value=0)
+
+    mock_db.return_value.__getitem__ = lambda self, key: mock_collection
+    return mock_db
+
+
 @pytest.fixture
-def mock_database():
-    """Mock database operations."""
-    with patch('app.core.database.db_manager.get_database') as mock_db:
-        mock_collection = MagicMock()
-        mock_collection.find.return_value.to_list = AsyncMock(return_value=[])
-        mock_collection.find_one = AsyncMock(return_value=None)
-        mock_collection.insert_one = AsyncMock(return_value=MagicMock(inserted_id="test_id"))
-        mock_collection.update_one = AsyncMock()
-        mock_collection.delete_one = AsyncMock()
-        mock_collection.count_documents = AsyncMock(return_value=0)
-        
-        mock_db.return_value.__getitem__ = lambda self, key: mock_collection
-        yield mock_db
+def mock_database(_mock_database_instance, monkeypatch):
+    """Mock database operations (shared tree, per-test install and reset)."""
+    monkeypatch.setattr(
+        'app.core.database.db_manager.get_database', _mock_database_instance
+    )
+    yield _mock_database_instance
+    _mock_database_instance.reset_mock()
 
 
 @pytest.fixture
@@ -69,16 +169,16 @@ def mock_openai():
 
 @pytest.fixture
 def mock_vector_store():
-    """Mock vector store operations."""
-    with patch('app.services.vector_store.FAISSVectorStore') as mock_vs:
-        mock_instance = MagicMock()
-        mock_instance.add_vectors = AsyncMock()
-        mock_instance.search = AsyncMock(return_value=[
-            ({"chunk_id": "test_chunk", "text": "test content"}, 0.9)
-        ])
-        mock_instance.delete_by_document_id = AsyncMock()
-        mock_vs.return_value = mock_instance
-        yield mock_instance
+    """Mock vector store operations (reuses the seeded session singleton)."""
+    import app.services.vector_store as vector_store_module
+
+    mock_instance = vector_store_module._vector_store
+    mock_instance.search.return_value = [
+        ({"chunk_id": "test_chunk", "text": "test content"}, 0.9)
+    ]
+    yield mock_instance
+    mock_instance.search.return_value = []
+    mock_instance.reset_mock()
 
 
 @pytest.fixture
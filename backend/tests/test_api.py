@@ -5,6 +5,19 @@ Run with: pytest -v
 import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
 
+# Keep endpoint tests on one xdist worker so they share a single app
+pytestmark = pytest.mark.xdist_group(name="api")
+
+
+@pytest.fixture(scope="module")
+def fake_rag():
+    """Shared AsyncMock for RAGChatService.chat.
+
+    Built once per module; tests needing a different reply can set
+    fake_rag.return_value instead of constructing a new mock.
+    """
+    return AsyncMock(return_value={"answer": "Test answer", "sources": []})
+
 
 class TestHealthEndpoints:
     """Test health and root endpoints."""
@@ -45,43 +58,39 @@ class TestDocumentEndpoints:
     
     def test_list_documents(self, client, auth_headers, mock_database):
         """Test listing documents."""
-        with patch('app.api.documents.get_current_user', return_value={"id": "test_user"}):
-            response = client.get("/api/v1/documents/", headers=auth_headers)
-            assert response.status_code == 200
-            assert isinstance(response.json(), list)
+        response = client.get("/api/v1/documents/", headers=auth_headers)
+        assert response.status_code == 200
+        assert isinstance(response.json(), list)
     
     def test_get_nonexistent_document(self, client, auth_headers, mock_database):
         """Test getting non-existent document."""
-        with patch('app.api.documents.get_current_user', return_value={"id": "test_user"}):
-            response = client.get("/api/v1/documents/nonexistent_id", headers=auth_headers)
-            assert response.status_code == 404
+        response = client.get("/api/v1/documents/nonexistent_id", headers=auth_headers)
+        assert response.status_code == 404
     
     def test_get_stats(self, client, auth_headers, mock_database):
         """Test getting statistics."""
-        with patch('app.api.documents.get_current_user', return_value={"id": "test_user"}):
-            response = client.get("/api/v1/documents/stats/overview", headers=auth_headers)
-            assert response.status_code == 200
-            data = response.json()
-            assert "total_documents" in data
+        response = client.get("/api/v1/documents/stats/overview", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert "total_documents" in data
 
 
 class TestChatEndpoints:
     """Test chat endpoints."""
     
-    def test_chat_without_documents(self, client, auth_headers, mock_database, mock_vector_store):
+    def test_chat_without_documents(self, client, auth_headers, mock_database, mock_vector_store, fake_rag, monkeypatch):
         """Test chat when no documents exist."""
-        with patch('app.api.chat.get_current_user', return_value={"id": "test_user"}), \
-             patch('app.services.rag_chat.RAGChatService.answer_question', 
-                   new_callable=AsyncMock, 
-                   return_value={"answer": "Test answer", "sources": []}):
-            response = client.post(
-                "/api/v1/chat/",
-                json={"question": "What is this about?"},
-                headers=auth_headers
-            )
-            assert response.status_code == 200
-            data = response.json()
-            assert "answer" in data
+        monkeypatch.setattr(
+            'app.services.rag_chat.RAGChatService.chat', fake_rag
+        )
+        response = client.post(
+            "/api/v1/chat/",
+            json={"question": "What is this about?"},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert "answer" in data
     
     def test_chat_invalid_request(self, client, auth_headers):
         """Test chat with invalid request."""
@@ -94,14 +103,9 @@ class TestChatEndpoints:
     
     def test_semantic_search(self, client, auth_headers, mock_vector_store):
         """Test semantic search endpoint."""
-        with patch('app.api.chat.get_current_user', return_value={"id": "test_user"}):
-            response = client.post(
-                "/api/v1/chat/search",
-                json={"query": "test query", "top_k": 5},
-                headers=auth_headers
-            )
-            assert response.status_code == 200
-
-
-if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
+        response = client.post(
+            "/api/v1/chat/search",
+            json={"query": "test query", "top_k": 5},
+            headers=auth_headers
+        )
+        assert response.status_code == 200